@@ -1,4 +1,7 @@
 import io
+import os
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 
 import PyPDF2
 import docx
@@ -8,6 +11,7 @@ import streamlit as st
 from helpers.constant import FEATURE_OPTIONS
 from helpers.job_analyser_llm import JobAnalyser
 from helpers.pinecone_handler import PineconeHandler
+from helpers.tracing import tracer
 
 
 class DocumentProcessor:
@@ -30,20 +34,32 @@ class DocumentProcessor:
         """Process uploaded resume file and extract text"""
         file_bytes = io.BytesIO(resume_file.read())
 
-        if resume_file.type == "application/pdf":
-            return DocumentProcessor.extract_text_from_pdf(file_bytes)
-        elif resume_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            return DocumentProcessor.extract_text_from_docx(file_bytes)
-        else:
-            raise ValueError(f"Unsupported file type: {resume_file.type}")
+        with tracer.span("resume.process", file_type=resume_file.type, bytes=file_bytes.getbuffer().nbytes) as span:
+            if resume_file.type == "application/pdf":
+                text = DocumentProcessor.extract_text_from_pdf(file_bytes)
+            elif resume_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+                text = DocumentProcessor.extract_text_from_docx(file_bytes)
+            else:
+                raise ValueError(f"Unsupported file type: {resume_file.type}")
+            span.set_attribute("chars", len(text))
+
+        return text
 
 
 class JobSearchApp:
     """Main application class for Smart Job Search"""
+    PAGE_SIZE = 20
+    POLL_INTERVAL = 0.25
+    SEARCH_WORKERS = int(os.environ.get('SEARCH_WORKERS', 4))
+    ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', 8))
+    PREFETCH_WORKERS = int(os.environ.get('PREFETCH_WORKERS', 2))
+    PREFETCH_ANALYSIS = os.environ.get('PREFETCH_ANALYSIS', 'true').lower() != 'false'
 
     def __init__(self):
         self._initialise_session_state()
         self._setup_page_layout()
+        if os.environ.get('TRACING_PROMETHEUS_PATH'):
+            self._start_metrics_exporter()
 
     @staticmethod
     def _initialise_session_state():
@@ -62,6 +78,61 @@ class JobSearchApp:
             st.session_state.show_job_description = True
         if 'search_query' not in st.session_state:
             st.session_state.search_query = None
+        if 'search_request' not in st.session_state:
+            st.session_state.search_request = None
+        if 'search_future' not in st.session_state:
+            st.session_state.search_future = None
+        if 'search_top_k' not in st.session_state:
+            st.session_state.search_top_k = JobSearchApp.PAGE_SIZE
+        if 'search_error' not in st.session_state:
+            st.session_state.search_error = None
+        if 'prefetch' not in st.session_state:
+            st.session_state.prefetch = None
+        if 'page' not in st.session_state:
+            st.session_state.page = 0
+        if 'analysis_futures' not in st.session_state:
+            st.session_state.analysis_futures = {}
+        if 'analysis_streams' not in st.session_state:
+            st.session_state.analysis_streams = {}
+        if 'analysis_cancel_events' not in st.session_state:
+            st.session_state.analysis_cancel_events = {}
+        if 'analysis_job_id' not in st.session_state:
+            st.session_state.analysis_job_id = None
+        if 'analysis_error' not in st.session_state:
+            st.session_state.analysis_error = None
+
+    @staticmethod
+    @st.cache_resource
+    def _get_search_executor():
+        """Return the executor for requested searches shared by all sessions, so that they never wait for analyses"""
+        return ThreadPoolExecutor(max_workers=JobSearchApp.SEARCH_WORKERS, thread_name_prefix="search")
+
+    @staticmethod
+    @st.cache_resource
+    def _get_analysis_executor():
+        """Return the executor for requested analyses shared by all sessions"""
+        return ThreadPoolExecutor(max_workers=JobSearchApp.ANALYSIS_WORKERS, thread_name_prefix="analysis")
+
+    @staticmethod
+    @st.cache_resource
+    def _get_prefetch_executor():
+        """Return the executor for speculative prefetches shared by all sessions, separate from requested work"""
+        return ThreadPoolExecutor(max_workers=JobSearchApp.PREFETCH_WORKERS, thread_name_prefix="prefetch")
+
+    @staticmethod
+    @st.cache_resource
+    def _get_prefetch_slots():
+        """Return the semaphore allowing one prefetch per prefetch worker, so that prefetches never queue"""
+        return threading.BoundedSemaphore(JobSearchApp.PREFETCH_WORKERS)
+
+    @staticmethod
+    @st.cache_resource
+    def _start_metrics_exporter():
+        """Start the periodic Prometheus export once per process"""
+        return tracer.start_prometheus_exporter(
+            os.environ['TRACING_PROMETHEUS_PATH'],
+            interval=float(os.environ.get('TRACING_EXPORT_INTERVAL', 15))
+        )
 
     @staticmethod
     def _setup_page_layout():
@@ -71,6 +142,9 @@ class JobSearchApp:
 
     def run(self):
         """Main method to run the application"""
+        # Pick up searches and analyses finished in the background since the last run
+        self._collect_background_results()
+
         # Create tabs for different search methods
         tab1, tab2 = st.tabs(["Search with Resume", "Search by Query"])
 
@@ -99,10 +173,10 @@ class JobSearchApp:
                 st.warning("Please either upload your resume or enter search keywords")
             elif has_resume and not has_keywords:
                 pinecone_query = f"""Resume: {st.session_state.resume_text} Query: {st.session_state.search_query}"""
-                self._perform_job_search(pinecone_query)
+                self._start_job_search(pinecone_query)
             else:
                 pinecone_query = st.session_state.resume_text or st.session_state.search_query
-                self._perform_job_search(pinecone_query)
+                self._start_job_search(pinecone_query)
 
         # Create two columns for displaying jobs and details
         col1, col2 = st.columns(2)
@@ -113,6 +187,16 @@ class JobSearchApp:
         with col2:
             self._display_job_details()
 
+            # Poll until the searches and analyses the user is waiting for have finished, streaming the analysis
+            if self._has_pending_tasks():
+                self._poll_background_tasks()
+
+        # Speculatively fetch the next page and the top job's analysis while the user reads this page
+        self._schedule_prefetch()
+
+        # Display optional timings panel
+        self._display_timings_panel()
+
     @staticmethod
     def _display_resume_search_tab():
         """Display and handle resume upload tab"""
@@ -128,7 +212,15 @@ class JobSearchApp:
         elif resume is not None:
             try:
                 # Process the uploaded resume
-                st.session_state.resume_text = DocumentProcessor.process_resume(resume)
+                resume_text = DocumentProcessor.process_resume(resume)
+
+                # Analyses of the previous resume no longer apply
+                if resume_text != st.session_state.resume_text:
+                    JobSearchApp._cancel_analyses()
+                    st.session_state.analysis_futures = {}
+                    st.session_state.analysis_streams = {}
+                    st.session_state.analysis_cancel_events = {}
+                st.session_state.resume_text = resume_text
                 st.success("Resume uploaded and processed successfully!")
 
                 with st.expander("Preview Resume Text"):
@@ -169,10 +261,8 @@ class JobSearchApp:
         )
 
     @staticmethod
-    def _perform_job_search(query, top_k=20):
-        """Perform search using Pinecone vector database"""
-
-        # Build filter dict for metadata filtering
+    def _build_filter_dict():
+        """Build filter dict for metadata filtering"""
         filter_dict = {}
 
         if st.session_state.location_filter:
@@ -184,21 +274,258 @@ class JobSearchApp:
         if st.session_state.classification_filter:
             filter_dict["metadata.classification.name"] = {"$in": st.session_state.classification_filter}
 
-        # Perform the search with filters
+        return filter_dict
+
+    @staticmethod
+    def _search_jobs(query, filter_dict, top_k):
+        """Perform search using Pinecone vector database, run on the search executor"""
         handler = PineconeHandler(index_name='seek-ads')
-        st.session_state.job_df = handler.search(
+        return handler.search(
             namespace="job-description-namespace",
             query=query,
             top_k=top_k,
             filter_dict=filter_dict
         )
 
+    @staticmethod
+    def _generate_analysis(resume_text, job_description, stream, cancel_event):
+        """Generate the resume fit analysis, run on the analysis executor, appending text to stream as it arrives.
+
+        Setting cancel_event stops the analysis at the next streamed chunk, so superseded analyses stop spending
+        tokens and free their worker.
+        """
+        def append_text(**kwargs):
+            # Raising from the callback handler ends the agent's stream
+            if cancel_event.is_set():
+                raise CancelledError("Analysis was superseded")
+            if kwargs.get('data'):
+                stream.append(kwargs['data'])
+
+        job_analyser = JobAnalyser(
+            user_resume=resume_text,
+            job_description=job_description,
+            callback_handler=append_text
+        )
+        return job_analyser.generate_analysis()
+
+    @staticmethod
+    def _submit_prefetch(func, *args):
+        """Submit speculative work if a prefetch worker is free, returning None when they are all busy"""
+        slots = JobSearchApp._get_prefetch_slots()
+        if not slots.acquire(blocking=False):
+            return None
+
+        future = JobSearchApp._get_prefetch_executor().submit(func, *args)
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    @staticmethod
+    def _submit_search(top_k, prefetch=False):
+        """Submit a search for the current request returning the top_k results, or None if a prefetch is skipped"""
+        request = st.session_state.search_request
+        args = (JobSearchApp._search_jobs, request['query'], request['filter_dict'], top_k)
+        if prefetch:
+            return JobSearchApp._submit_prefetch(*args)
+        return JobSearchApp._get_search_executor().submit(*args)
+
+    @staticmethod
+    def _start_job_search(query):
+        """Start a new search in the background, superseding any pending search and analysis"""
+        JobSearchApp._cancel_search()
+        JobSearchApp._cancel_analyses()
+
+        st.session_state.search_request = {'query': query, 'filter_dict': JobSearchApp._build_filter_dict()}
+        st.session_state.search_future = JobSearchApp._submit_search(JobSearchApp.PAGE_SIZE)
+        st.session_state.search_top_k = JobSearchApp.PAGE_SIZE
+        st.session_state.search_error = None
+        st.session_state.job_df = None
+        st.session_state.page = 0
+
+    @staticmethod
+    def _cancel_search():
+        """Cancel the pending search and next page prefetch; results of calls already running are discarded"""
+        if st.session_state.search_future is not None:
+            st.session_state.search_future.cancel()
+            st.session_state.search_future = None
+
+        if st.session_state.prefetch is not None:
+            st.session_state.prefetch['future'].cancel()
+            st.session_state.prefetch = None
+
+    @staticmethod
+    def _cancel_analyses(keep=()):
+        """Cancel and forget unfinished analyses except for the job ids in keep; finished ones stay cached per job"""
+        for job_id, future in list(st.session_state.analysis_futures.items()):
+            if job_id not in keep and not future.done():
+                # cancel() only stops queued analyses; the event stops running ones
+                st.session_state.analysis_futures.pop(job_id).cancel()
+                st.session_state.analysis_cancel_events.pop(job_id).set()
+                st.session_state.analysis_streams.pop(job_id, None)
+
+        if st.session_state.analysis_job_id not in keep:
+            st.session_state.analysis_job_id = None
+
+    @staticmethod
+    def _request_analysis(job, prefetch=False):
+        """Submit an analysis for the job unless one is already running or finished, or prefetch workers are busy"""
+        if job['id'] in st.session_state.analysis_futures:
+            return
+
+        stream = []
+        cancel_event = threading.Event()
+        args = (JobSearchApp._generate_analysis, st.session_state.resume_text, job['content'], stream, cancel_event)
+        if prefetch:
+            future = JobSearchApp._submit_prefetch(*args)
+        else:
+            future = JobSearchApp._get_analysis_executor().submit(*args)
+
+        if future is not None:
+            st.session_state.analysis_futures[job['id']] = future
+            st.session_state.analysis_streams[job['id']] = stream
+            st.session_state.analysis_cancel_events[job['id']] = cancel_event
+
+    @staticmethod
+    def _collect_background_results():
+        """Move finished background results into session state"""
+        search_future = st.session_state.search_future
+        if search_future is not None and search_future.done():
+            st.session_state.search_future = None
+            try:
+                st.session_state.job_df = search_future.result()
+            except Exception as e:
+                st.session_state.search_error = str(e)
+
+        analysis_job_id = st.session_state.analysis_job_id
+        analysis_future = st.session_state.analysis_futures.get(analysis_job_id)
+        if analysis_future is not None and analysis_future.done():
+            st.session_state.analysis_job_id = None
+            try:
+                analysis = analysis_future.result()
+            except Exception as e:
+                analysis = None
+                st.session_state.analysis_error = str(e)
+
+            if analysis:
+                st.session_state.job_analysis = analysis
+                st.session_state.show_job_description = False
+            else:
+                # Forget the failed analysis so that it can be retried
+                st.session_state.analysis_futures.pop(analysis_job_id)
+                st.session_state.analysis_streams.pop(analysis_job_id, None)
+                st.session_state.analysis_cancel_events.pop(analysis_job_id, None)
+                st.session_state.analysis_error = st.session_state.analysis_error or "No analysis was generated"
+                st.session_state.show_job_description = True
+
+    @staticmethod
+    def _current_page_df():
+        """Return the results on the current page"""
+        start = st.session_state.page * JobSearchApp.PAGE_SIZE
+        return st.session_state.job_df.iloc[start:start + JobSearchApp.PAGE_SIZE]
+
+    @staticmethod
+    def _has_more_results():
+        """Whether the last search filled every requested result, so a further page may exist"""
+        return st.session_state.job_df is not None and len(st.session_state.job_df) >= st.session_state.search_top_k
+
+    @staticmethod
+    def _schedule_prefetch():
+        """Prefetch the next page of results and the analysis of the top job on the current page.
+
+        Prefetches run on their own executor and are skipped while its workers are busy, so that searches and
+        analyses the user asks for never wait behind them; skipped prefetches are retried on the next rerun.
+        """
+        if st.session_state.search_future is not None or st.session_state.job_df is None:
+            return
+
+        # Only prefetch rows beyond those already loaded or being prefetched, e.g. not after going back a page
+        next_top_k = (st.session_state.page + 2) * JobSearchApp.PAGE_SIZE
+        prefetch = st.session_state.prefetch
+        needs_rows = next_top_k > len(st.session_state.job_df) and (prefetch is None or prefetch['top_k'] < next_top_k)
+        if JobSearchApp._has_more_results() and needs_rows:
+            future = JobSearchApp._submit_search(next_top_k, prefetch=True)
+            if future is not None:
+                st.session_state.prefetch = {'top_k': next_top_k, 'future': future}
+
+        page_df = JobSearchApp._current_page_df()
+        if JobSearchApp.PREFETCH_ANALYSIS and st.session_state.resume_text and not page_df.empty:
+            JobSearchApp._request_analysis(page_df.iloc[0], prefetch=True)
+
+    @staticmethod
+    def _go_to_page(page):
+        """Show the given page, using the prefetched results when they cover it"""
+        st.session_state.page = page
+        top_k = (page + 1) * JobSearchApp.PAGE_SIZE
+        if len(st.session_state.job_df) >= top_k or not JobSearchApp._has_more_results():
+            return
+
+        # Adopt the prefetch as the current search, or search now if it has not been submitted yet
+        prefetch = st.session_state.prefetch
+        if prefetch is not None and prefetch['top_k'] >= top_k:
+            st.session_state.search_future = prefetch['future']
+            st.session_state.search_top_k = prefetch['top_k']
+            st.session_state.prefetch = None
+        else:
+            st.session_state.search_future = JobSearchApp._submit_search(top_k)
+            st.session_state.search_top_k = top_k
+        JobSearchApp._collect_background_results()
+
+    @staticmethod
+    def _has_pending_tasks():
+        """Whether a search or a requested analysis is still running"""
+        analysis_future = st.session_state.analysis_futures.get(st.session_state.analysis_job_id)
+        return st.session_state.search_future is not None or analysis_future is not None
+
+    @staticmethod
+    def _render_background_progress():
+        """Display the requested analysis streamed so far and return whether any pending task has finished"""
+        search_future = st.session_state.search_future
+        analysis_future = st.session_state.analysis_futures.get(st.session_state.analysis_job_id)
+
+        stream = st.session_state.analysis_streams.get(st.session_state.analysis_job_id)
+        if analysis_future is not None and stream:
+            st.markdown("#### AI-Generated Resume Fit Analysis")
+            st.markdown("".join(stream))
+
+        # Finished results are collected on the next app run, so one task must not wait for the other
+        return any(future is not None and future.done() for future in (search_future, analysis_future))
+
+    @staticmethod
+    @st.fragment(run_every=POLL_INTERVAL)
+    def _poll_background_tasks():
+        """Stream the requested analysis and rerun the app as soon as the pending search or analysis has finished"""
+        if JobSearchApp._render_background_progress():
+            st.rerun()
+
     def _display_job_listings(self):
-        """Display job listing cards in the left column"""
+        """Display job listing cards for the current page in the left column"""
+        if st.session_state.search_error:
+            st.error(f"Error searching jobs: {st.session_state.search_error}")
+
+        if st.session_state.search_future is not None:
+            st.info("Searching for jobs...")
+
         if st.session_state.job_df is not None:
-            st.markdown("---")
-            for i, row in st.session_state.job_df.iterrows():
-                self._render_job_card(row)
+            page_df = self._current_page_df()
+            with tracer.span("render.job_listings", rows=len(page_df)):
+                st.markdown("---")
+                for i, row in page_df.iterrows():
+                    self._render_job_card(row)
+
+            if st.session_state.search_future is None:
+                if page_df.empty:
+                    st.caption("No more jobs found")
+                self._display_page_navigation()
+
+    def _display_page_navigation(self):
+        """Display previous and next page buttons, changing page in callbacks so that one rerun suffices"""
+        col1, col2 = st.columns(2)
+        page = st.session_state.page
+        has_next_page = len(st.session_state.job_df) > (page + 1) * self.PAGE_SIZE or self._has_more_results()
+
+        col1.button("Previous page", key="previous_page", disabled=page == 0,
+                    on_click=self._go_to_page, args=(page - 1,))
+        col2.button("Next page", key="next_page", disabled=not has_next_page,
+                    on_click=self._go_to_page, args=(page + 1,))
 
     def _render_job_card(self, job):
         """Render a single job card"""
@@ -221,21 +548,36 @@ class JobSearchApp:
                 # View details button
                 if st.button(f"View Details", key=f"view_{job['id']}"):
                     st.session_state.selected_job_id = job['id']
+                    st.session_state.analysis_job_id = None
                     st.session_state.job_analysis = None
+                    st.session_state.analysis_error = None
                     st.session_state.show_job_description = True
 
+                    # Analyses of other jobs are superseded, except the speculative one for the top job
+                    page_df = self._current_page_df()
+                    self._cancel_analyses(keep={job['id'], page_df.iloc[0]['id']})
+
             st.markdown("---")
 
     def _display_job_details(self):
         """Display job details in the right column"""
         if st.session_state.selected_job_id and st.session_state.job_df is not None:
-            job = st.session_state.job_df[st.session_state.job_df['id'] == st.session_state.selected_job_id].iloc[0]
+            selected_df = st.session_state.job_df[st.session_state.job_df['id'] == st.session_state.selected_job_id]
+            if selected_df.empty:
+                return
+            job = selected_df.iloc[0]
             st.markdown(f"#### {self._escape_markdown(job['title'])}")
 
             # Analyze Resume Fit button
             if st.button(f"Analyse Resume Fit", key=f"analyse_{st.session_state.selected_job_id}"):
                 self._analyse_resume_fit(job)
 
+            if st.session_state.analysis_job_id == st.session_state.selected_job_id:
+                st.info("Analysing resume fit...")
+
+            if st.session_state.analysis_error:
+                st.error(f"Error analysing resume fit: {st.session_state.analysis_error}")
+
             # Display either job analysis or job description
             if st.session_state.job_analysis and not st.session_state.show_job_description:
                 st.markdown("#### AI-Generated Resume Fit Analysis")
@@ -251,19 +593,43 @@ class JobSearchApp:
         st.markdown("---")
 
         if st.session_state.resume_text:
-            job_description = job['content']
-
-            with st.spinner("Analysing resume fit..."):
-                job_analyser = JobAnalyser(
-                    user_resume=st.session_state.resume_text,
-                    job_description=job_description
-                )
-                analysis = job_analyser.generate_analysis()
-                st.session_state.job_analysis = analysis
-                st.session_state.show_job_description = False
+            # Reuse the prefetched analysis if there is one, otherwise start it in the background
+            JobSearchApp._request_analysis(job)
+            st.session_state.analysis_job_id = job['id']
+            st.session_state.analysis_error = None
+
+            # The analysis streams in below in place of the job description
+            st.session_state.show_job_description = False
+            JobSearchApp._collect_background_results()
         else:
             st.warning("Please upload your resume first to analyse fit")
 
+    @staticmethod
+    def _display_timings_panel():
+        """Display span latency percentiles and recent spans in the sidebar"""
+        if not st.sidebar.checkbox("Show timings", key="show_timings"):
+            return
+
+        summaries = tracer.summary()
+        if not summaries:
+            st.sidebar.caption("No spans recorded yet")
+            return
+
+        # Convert durations to milliseconds for display
+        timings_df = pd.DataFrame(summaries).set_index('name')
+        timings_df = timings_df[['count', 'p50', 'p95', 'p99']]
+        timings_df[['p50', 'p95', 'p99']] = (timings_df[['p50', 'p95', 'p99']] * 1000).round(1)
+        st.sidebar.markdown("**Latency (ms)**")
+        st.sidebar.dataframe(timings_df)
+
+        with st.sidebar.expander("Recent spans"):
+            for span in tracer.recent_spans()[:10]:
+                st.markdown(f"`{span['name']}` {span['duration_ms']:.1f} ms")
+                st.json(span['attributes'], expanded=False)
+
+        st.sidebar.download_button("Export Prometheus", tracer.to_prometheus(), file_name="timings.prom")
+        st.sidebar.download_button("Export JSON lines", tracer.to_json_lines(), file_name="timings.jsonl")
+
     @staticmethod
     def _escape_markdown(text):
         """Escape special characters in Markdown text"""
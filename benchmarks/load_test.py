@@ -0,0 +1,406 @@
+import argparse
+import functools
+import gc
+import json
+import os
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+
+# app builds the OpenAI client at import time; the stand-in agent below makes no requests
+os.environ.setdefault('OPENAI_API_KEY', 'load-test')
+
+from streamlit.runtime import Runtime
+from streamlit.testing.v1 import AppTest
+
+from app import JobSearchApp
+from benchmarks.run_benchmarks import RESULTS_DIR, BenchmarkRunner
+from benchmarks.synthetic_ads import SearchResponse, SyntheticAdGenerator
+from helpers.tracing import tracer
+
+QUERIES = [
+    'Data scientist using Python and machine learning',
+    'Part time barista in Melbourne',
+    'Senior developer with cloud experience',
+    'Registered nurse night shifts',
+    'Entry level accounting role'
+]
+LOCATION_FILTERS = [['Sydney'], ['Melbourne'], ['Sydney', 'Melbourne', 'Brisbane']]
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def _jittered_sleep(latency: float):
+    """Sleep for latency seconds +/- 20%."""
+    if latency > 0:
+        time.sleep(latency * random.uniform(0.8, 1.2))
+
+
+class LocalIndex:
+    """Stand-in for a Pinecone index that samples hits from synthetic ads after a configurable delay."""
+
+    def __init__(self, records: list[dict], latency: float):
+        self.records = records
+        self.latency = latency
+
+    def _matches(self, record: dict, filter_dict: dict | None) -> bool:
+        """Apply the {field: {"$in": [...]}} filters used by the app."""
+        return all(record.get(field) in condition['$in'] for field, condition in (filter_dict or {}).items())
+
+    def search(self, namespace: str, query: dict) -> SearchResponse:
+        """Return the top_k matching records, ranked in a fixed order per query text, as a Pinecone search response."""
+        _jittered_sleep(self.latency)
+        candidates = [record for record in self.records if self._matches(record, query.get('filter'))]
+
+        # A larger top_k for the same query returns a superset in the same order, as with the real index
+        random.Random(query['inputs']['text']).shuffle(candidates)
+        hits = candidates[:query['top_k']]
+        pages = SyntheticAdGenerator.to_search_results(hits, top_k=query['top_k'])
+        return pages[0] if pages else SearchResponse([])
+
+
+class LocalPinecone:
+    """Stand-in for the Pinecone client."""
+
+    def __init__(self, records: list[dict], latency: float, api_key: str | None = None):
+        self._index = LocalIndex(records, latency)
+
+    def Index(self, name: str) -> LocalIndex:
+        return self._index
+
+
+class LocalAgent:
+    """Stand-in for the strands Agent that streams a canned analysis over a configurable delay."""
+    ANALYSIS = "✅ OVERALL FIT SUMMARY\n\nStrong fit.\n\n---\n\n🎯 WHY YOU ARE A GOOD MATCH\n- Relevant experience"
+    CHUNKS = 8
+
+    def __init__(self, latency: float, callback_handler=None, **kwargs):
+        self.latency = latency
+        self.callback_handler = callback_handler
+
+    def __call__(self, prompt: str):
+        # Pass the text to the callback handler in chunks spread over the latency, as streamed by the model
+        chunk_size = -(-len(self.ANALYSIS) // self.CHUNKS)
+        for i in range(0, len(self.ANALYSIS), chunk_size):
+            _jittered_sleep(self.latency / self.CHUNKS)
+            if self.callback_handler:
+                self.callback_handler(data=self.ANALYSIS[i:i + chunk_size])
+
+        return SimpleNamespace(
+            message={'role': 'assistant', 'content': [{'text': self.ANALYSIS}]},
+            metrics=SimpleNamespace(accumulated_usage={
+                'inputTokens': len(prompt) // 4,
+                'outputTokens': len(self.ANALYSIS) // 4
+            })
+        )
+
+
+class UploadedResume:
+    """Stand-in for a Streamlit UploadedFile holding a DOCX resume."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self.name = 'resume.docx'
+        self.type = DOCX_TYPE
+
+    def read(self) -> bytes:
+        return self._data
+
+
+# Most recent mock runtime set by AppTest, shared by all simulated users
+_last_runtime = None
+
+
+def _shared_runtime_instance(cls):
+    """Runtime.instance replacement that keeps returning AppTest's mock runtime between runs.
+
+    AppTest sets the global Runtime._instance at the start of each run and clears it at the end,
+    which breaks other sessions running concurrently in the same process.
+    """
+    global _last_runtime
+    if cls._instance is not None:
+        _last_runtime = cls._instance
+    if _last_runtime is None:
+        raise RuntimeError("Runtime hasn't been created!")
+    return _last_runtime
+
+
+def _poll_without_fragment():
+    """_poll_background_tasks without the fragment, as AppTest cannot run timer-driven fragment reruns.
+
+    The app's own progress check still renders the streamed analysis; its result is kept in session state so that
+    LoadTester._step can rerun the script in place of the fragment.
+    """
+    import streamlit as st
+
+    st.session_state.background_task_finished = JobSearchApp._render_background_progress()
+
+
+def _app_script():
+    """Script executed by AppTest for each simulated user."""
+    from app import JobSearchApp
+
+    app = JobSearchApp()
+    app.run()
+
+
+class LoadTester:
+    """Drive the JobSearchApp search and analysis flows headlessly for concurrent simulated users."""
+
+    def __init__(self,
+                 users: int = 10,
+                 iterations: int = 3,
+                 search_latency: float = 0.3,
+                 llm_latency: float = 2.0,
+                 think_time: float = 0.0,
+                 ramp_up: float = 0.0,
+                 with_resume: bool = True,
+                 measure_memory: bool = True,
+                 timeout: float = 60.0,
+                 seed: int = 42,
+                 n_ads: int = 2000):
+        """Initialise with the number of users, search/analyse cycles per user and stand-in latencies in seconds."""
+        self.users = users
+        self.iterations = iterations
+        self.search_latency = search_latency
+        self.llm_latency = llm_latency
+        self.think_time = think_time
+        self.ramp_up = ramp_up
+        self.with_resume = with_resume
+        self.measure_memory = measure_memory
+        self.timeout = timeout
+        self.seed = seed
+
+        generator = SyntheticAdGenerator(seed)
+        self.records = [SyntheticAdGenerator.to_index_record(generator.generate_ad(38800000 + i)) for i in range(n_ads)]
+        self.resume_docx = generator.resume_docx()
+
+    def _step(self, at: AppTest, user_id: int, iteration: int, step: str, timings: list[dict], action=None,
+              pending=None, streamed=False):
+        """Apply a widget action and rerun the script, then wait for the future returned by pending to be collected.
+
+        For streamed steps, also record when analysis text was first displayed, before the step ends if it streamed.
+        """
+        error = None
+        first_output_seconds = None
+        start = time.perf_counter()
+        try:
+            if action:
+                action()
+            at.run(timeout=self.timeout)
+
+            # Searches and analyses finish in the background; stand in for the app's polling fragment by rerunning
+            # the script every poll interval, or straight away once the app reports that a task has finished
+            while pending and not at.exception and pending() is not None:
+                if time.perf_counter() - start > self.timeout:
+                    raise TimeoutError(f"{step} did not finish within {self.timeout}s")
+                if streamed and first_output_seconds is None and self._shows_analysis(at):
+                    first_output_seconds = time.perf_counter() - start
+                if not at.session_state['background_task_finished']:
+                    time.sleep(JobSearchApp.POLL_INTERVAL)
+                at.run(timeout=self.timeout)
+
+            if at.exception:
+                error = at.exception[0].message
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - start
+
+        if streamed and first_output_seconds is None and self._shows_analysis(at):
+            first_output_seconds = seconds
+        timings.append({'user': user_id, 'iteration': iteration, 'step': step, 'seconds': seconds,
+                        'first_output_seconds': first_output_seconds, 'error': error})
+        return error is None
+
+    @staticmethod
+    def _shows_analysis(at: AppTest) -> bool:
+        """Whether the resume fit analysis, complete or partial, is displayed."""
+        return any(markdown.value == "#### AI-Generated Resume Fit Analysis" for markdown in at.markdown)
+
+    def _simulate_user(self, user_id: int) -> tuple[list[dict], AppTest]:
+        """Load the app, then repeatedly search, open the top job, analyse resume fit and go to the next page."""
+        rng = random.Random(self.seed + user_id)
+        if self.ramp_up and self.users > 1:
+            time.sleep(self.ramp_up * user_id / (self.users - 1))
+
+        timings = []
+        at = AppTest.from_function(_app_script, default_timeout=self.timeout)
+        if not self._step(at, user_id, 0, 'load', timings):
+            return timings, at
+
+        for iteration in range(self.iterations):
+            query = rng.choice(QUERIES)
+            locations = rng.choice(LOCATION_FILTERS) if rng.random() < 0.5 else []
+
+            def search():
+                at.text_input(key="keyword_search_input").input(query)
+                at.multiselect(key="location_filter").set_value(locations)
+                next(button for button in at.button if button.label == "SEEK Jobs").click()
+
+            pending_search = lambda: at.session_state['search_future']
+            if not self._step(at, user_id, iteration, 'search', timings, search, pending=pending_search):
+                continue
+
+            job_df = at.session_state['job_df']
+            if job_df is None or job_df.empty:
+                continue
+            job_id = job_df.iloc[0]['id']
+
+            if not self._step(at, user_id, iteration, 'view_details', timings,
+                              lambda: at.button(key=f"view_{job_id}").click()):
+                continue
+
+            if self.with_resume:
+                pending_analysis = lambda: at.session_state['analysis_futures'].get(at.session_state['analysis_job_id'])
+                analyse = lambda: at.button(key=f"analyse_{job_id}").click()
+                self._step(at, user_id, iteration, 'analyse', timings, analyse, pending=pending_analysis, streamed=True)
+
+            # The next page is prefetched while the user reads the current one
+            next_page = next((button for button in at.button if button.key == "next_page"), None)
+            if next_page is not None and not next_page.disabled:
+                self._step(at, user_id, iteration, 'next_page', timings, next_page.click, pending=pending_search)
+
+            time.sleep(self.think_time)
+
+        return timings, at
+
+    def run(self) -> dict:
+        """Run all simulated users concurrently against local stand-ins and summarise the results."""
+        resume_file = functools.partial(UploadedResume, self.resume_docx) if self.with_resume else lambda: None
+        patches = [
+            mock.patch('helpers.pinecone_handler.Pinecone',
+                       functools.partial(LocalPinecone, self.records, self.search_latency)),
+            mock.patch('helpers.job_analyser_llm.Agent', functools.partial(LocalAgent, self.llm_latency)),
+            mock.patch('streamlit.file_uploader', lambda *args, **kwargs: resume_file()),
+            mock.patch.object(Runtime, 'instance', classmethod(_shared_runtime_instance)),
+            mock.patch.object(JobSearchApp, '_poll_background_tasks', staticmethod(_poll_without_fragment))
+        ]
+        for patch in patches:
+            patch.start()
+
+        memory = {}
+        try:
+            # Time without tracemalloc, as tracing inflates every latency considerably
+            start = time.perf_counter()
+            outcomes = self._run_users()
+            wall_seconds = time.perf_counter() - start
+            timings_df = pd.DataFrame([timing for timings, _ in outcomes for timing in timings])
+            spans = tracer.summary()
+            del outcomes
+
+            # Repeat the run under tracemalloc for memory only, discarding its timings
+            if self.measure_memory:
+                gc.collect()
+                tracemalloc.start()
+                baseline, _ = tracemalloc.get_traced_memory()
+                outcomes = self._run_users()
+
+                # Measure while every AppTest (and so its session state) is still alive
+                gc.collect()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del outcomes
+                memory = {
+                    'retained_mb_per_session': round((current - baseline) / self.users / 1024 ** 2, 2),
+                    'peak_mb': round((peak - baseline) / 1024 ** 2, 2)
+                }
+        finally:
+            for patch in patches:
+                patch.stop()
+
+        return self._summarise(timings_df, wall_seconds, memory, spans)
+
+    def _run_users(self) -> list[tuple[list[dict], AppTest]]:
+        """Run every simulated user concurrently and return their timings and AppTest sessions."""
+        with ThreadPoolExecutor(max_workers=self.users) as executor:
+            return list(executor.map(self._simulate_user, range(self.users)))
+
+    def _summarise(self, timings_df: pd.DataFrame, wall_seconds: float, memory: dict, spans: list[dict]) -> dict:
+        """Compute throughput and per-step latency percentiles."""
+        ok_df = timings_df[timings_df['error'].isna()]
+        steps = []
+        for step, step_df in timings_df.groupby('step', sort=False):
+            seconds = step_df.loc[step_df['error'].isna(), 'seconds']
+            first_output_seconds = step_df.loc[step_df['error'].isna(), 'first_output_seconds'].dropna()
+            steps.append({
+                'step': step,
+                'count': len(step_df),
+                'errors': int(step_df['error'].notna().sum()),
+                'throughput_per_second': round(len(seconds) / wall_seconds, 3),
+                'mean': round(seconds.mean(), 4),
+                'p50': round(seconds.quantile(0.5), 4),
+                'p95': round(seconds.quantile(0.95), 4),
+                'p99': round(seconds.quantile(0.99), 4),
+                'first_output_p50': round(first_output_seconds.quantile(0.5), 4) if len(first_output_seconds) else None
+            })
+
+        return {
+            'config': {
+                'users': self.users,
+                'iterations': self.iterations,
+                'search_latency': self.search_latency,
+                'llm_latency': self.llm_latency,
+                'think_time': self.think_time,
+                'ramp_up': self.ramp_up,
+                'with_resume': self.with_resume
+            },
+            'wall_seconds': round(wall_seconds, 3),
+            'reruns_per_second': round(len(ok_df) / wall_seconds, 3),
+            'steps': steps,
+            'memory': memory,
+            'errors': timings_df['error'].dropna().value_counts().head(5).to_dict(),
+            'spans': spans
+        }
+
+
+def save_report(report: dict) -> str:
+    """Save the load test report alongside the benchmark results."""
+    commit = BenchmarkRunner._git_commit()
+    timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = RESULTS_DIR / f'load_{timestamp}_{commit}.json'
+
+    with open(output_path, 'w') as f:
+        json.dump({'commit': commit, 'timestamp': timestamp, **report}, f, indent=2)
+
+    return str(output_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test the search and analysis flows with simulated users.")
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=3, help="Search/view/analyse cycles per user")
+    parser.add_argument('--search-latency', type=float, default=0.3, help="Stand-in Pinecone latency in seconds")
+    parser.add_argument('--llm-latency', type=float, default=2.0, help="Stand-in LLM latency in seconds")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Pause between cycles in seconds")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="Seconds over which users are started")
+    parser.add_argument('--no-resume', action='store_true', help="Search by query only and skip analysis")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the separate tracemalloc memory pass")
+    parser.add_argument('--timeout', type=float, default=60.0, help="Timeout per script rerun in seconds")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    load_tester = LoadTester(
+        users=args.users,
+        iterations=args.iterations,
+        search_latency=args.search_latency,
+        llm_latency=args.llm_latency,
+        think_time=args.think_time,
+        ramp_up=args.ramp_up,
+        with_resume=not args.no_resume,
+        measure_memory=not args.no_memory,
+        timeout=args.timeout,
+        seed=args.seed
+    )
+    report = load_tester.run()
+
+    print(pd.DataFrame(report['steps']).to_string(index=False))
+    print(f"Wall time: {report['wall_seconds']}s, reruns/s: {report['reruns_per_second']}, memory: {report['memory']}")
+    if report['errors']:
+        print(f"Errors: {report['errors']}")
+    print(f"Saved report to {save_report(report)}")
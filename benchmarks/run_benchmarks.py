@@ -0,0 +1,196 @@
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+# app builds the OpenAI client at import time; no requests are made by the benchmarks
+os.environ.setdefault('OPENAI_API_KEY', 'benchmark')
+
+from app import DocumentProcessor
+from benchmarks.synthetic_ads import SyntheticAdGenerator
+from helpers.data_loader import DataLoader
+from helpers.pinecone_handler import PineconeHandler
+
+SCALES = {
+    '10k': 10_000,
+    '50k': 50_000,
+    '500k': 500_000
+}
+DATA_DIR = Path(__file__).parent / 'data'
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+class BenchmarkRunner:
+    """Time the ingest, search-conversion and resume-parsing paths against synthetic corpora."""
+
+    def __init__(self, seed: int = 42, measure_memory: bool = True, resume_iterations: int = 50):
+        """Initialise with a corpus seed and whether to run a separate peak-memory pass per benchmark."""
+        self.seed = seed
+        self.measure_memory = measure_memory
+        self.resume_iterations = resume_iterations
+        self.results = []
+
+    def _measure(self, name: str, scale: str, n_items: int, func):
+        """Time func, optionally re-run it under tracemalloc for peak memory, record and return its result."""
+        # Time without tracemalloc, as tracing slows down allocation-heavy code considerably
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+
+        peak_memory_mb = None
+        if self.measure_memory:
+            del result
+            gc.collect()
+            tracemalloc.start()
+            result = func()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            peak_memory_mb = round(peak / 1024 ** 2, 2)
+
+        self.results.append({
+            'benchmark': name,
+            'scale': scale,
+            'items': n_items,
+            'seconds': round(seconds, 4),
+            'items_per_second': round(n_items / seconds, 1) if seconds > 0 else None,
+            'peak_memory_mb': peak_memory_mb
+        })
+        print(f"{name:<52} {scale:>6} {seconds:>10.3f}s {str(self.results[-1]['items_per_second']):>14} items/s")
+
+        return result
+
+    def run_ingest(self, scale: str):
+        """Benchmark the DataLoader and search-conversion paths at the given corpus scale."""
+        n_ads = SCALES[scale]
+        corpus_name = f'ads-{scale}-seed{self.seed}-{SyntheticAdGenerator.fingerprint()}.json'
+        corpus_path = SyntheticAdGenerator(self.seed).write_corpus(DATA_DIR / corpus_name, n_ads)
+        loader = DataLoader(str(corpus_path))
+
+        df = self._measure('DataLoader._load_json_to_df', scale, n_ads, loader._load_json_to_df)
+        self._measure('DataLoader.clean_html', scale, n_ads, lambda: df['content'].apply(DataLoader.clean_html))
+        self._measure('DataLoader._process_dataframe', scale, n_ads, lambda: loader._process_dataframe(df))
+        del df
+
+        # _create_embed_text loads and processes the file itself, so this covers the full chain up to embedding text
+        embed_df = self._measure('DataLoader._create_embed_text', scale, n_ads, loader._create_embed_text)
+
+        # Mirror get_data_for_insertion up to validation
+        embed_df = embed_df.drop(columns=['cleaned_content', 'metadata'], errors='ignore')
+        records = embed_df.rename(columns={'id': '_id'}).to_dict(orient='records')
+        del embed_df
+        validated_records = self._measure(
+            'DataLoader._validate_records', scale, n_ads, lambda: DataLoader._validate_records(records)
+        )
+        del records
+
+        pages = SyntheticAdGenerator.to_search_results(validated_records)
+        del validated_records
+        self._measure(
+            'PineconeHandler.convert_search_results_to_dataframe', scale, n_ads,
+            lambda: [PineconeHandler.convert_search_results_to_dataframe(page) for page in pages]
+        )
+
+    def run_documents(self):
+        """Benchmark resume text extraction for PDF and DOCX files."""
+        generator = SyntheticAdGenerator(self.seed)
+        pdf_bytes = generator.resume_pdf()
+        docx_bytes = generator.resume_docx()
+        n = self.resume_iterations
+
+        self._measure(
+            'DocumentProcessor.extract_text_from_pdf', 'resume', n,
+            lambda: [DocumentProcessor.extract_text_from_pdf(io.BytesIO(pdf_bytes)) for _ in range(n)]
+        )
+        self._measure(
+            'DocumentProcessor.extract_text_from_docx', 'resume', n,
+            lambda: [DocumentProcessor.extract_text_from_docx(io.BytesIO(docx_bytes)) for _ in range(n)]
+        )
+
+    @staticmethod
+    def _git_commit() -> str:
+        """Return the short hash of HEAD, suffixed with -dirty if there are uncommitted changes."""
+        try:
+            commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+            dirty = subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'], text=True).strip()
+            return f"{commit}-dirty" if dirty else commit
+        except Exception:
+            return "unknown"
+
+    def save_results(self, output_dir: Path = RESULTS_DIR) -> Path:
+        """Save results with commit and environment details so that runs can be compared across commits."""
+        commit = self._git_commit()
+        timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / f'{timestamp}_{commit}.json'
+
+        with open(output_path, 'w') as f:
+            json.dump({
+                'commit': commit,
+                'timestamp': timestamp,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'seed': self.seed,
+                'generator': SyntheticAdGenerator.fingerprint(),
+                'results': self.results
+            }, f, indent=2)
+
+        return output_path
+
+
+def compare_results(baseline_path: str, candidate_path: str) -> pd.DataFrame:
+    """Compare two saved result files; a time ratio above 1 means the candidate is slower."""
+    frames = []
+    generators = []
+    for path in (baseline_path, candidate_path):
+        with open(path, 'r') as f:
+            run = json.load(f)
+        frames.append(pd.DataFrame(run['results']).set_index(['benchmark', 'scale']))
+        generators.append(run.get('generator'))
+
+    if generators[0] != generators[1]:
+        print(f"Warning: results used different synthetic corpora (generator {generators[0]} vs {generators[1]})")
+
+    baseline_df, candidate_df = frames
+    comparison_df = baseline_df[['seconds', 'peak_memory_mb']].join(
+        candidate_df[['seconds', 'peak_memory_mb']], lsuffix='_baseline', rsuffix='_candidate', how='inner'
+    )
+    comparison_df['time_ratio'] = (comparison_df['seconds_candidate'] / comparison_df['seconds_baseline']).round(3)
+    comparison_df['memory_ratio'] = (
+        comparison_df['peak_memory_mb_candidate'] / comparison_df['peak_memory_mb_baseline']
+    ).round(3)
+
+    return comparison_df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the ingest and parsing micro-benchmarks.")
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=list(SCALES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--resume-iterations', type=int, default=50)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'),
+                        help="Compare two saved result files instead of running benchmarks")
+    args = parser.parse_args()
+
+    if args.compare:
+        print(compare_results(*args.compare).to_string())
+    else:
+        runner = BenchmarkRunner(
+            seed=args.seed,
+            measure_memory=not args.no_memory,
+            resume_iterations=args.resume_iterations
+        )
+        for scale in args.scales:
+            runner.run_ingest(scale)
+        runner.run_documents()
+        print(f"Saved results to {runner.save_results()}")
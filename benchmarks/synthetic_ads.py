@@ -0,0 +1,223 @@
+import hashlib
+import io
+import json
+import random
+from pathlib import Path
+
+import docx
+
+import helpers.constant
+from helpers.constant import FEATURE_OPTIONS
+
+
+class SyntheticAdGenerator:
+    """Generate SEEK-shaped job ads and resumes for benchmarking."""
+    # Missing rates observed in ads-50k.json (see the EDA in seek-case-study.ipynb)
+    SALARY_MISSING_RATE = 0.67
+    STANDOUT_MISSING_RATE = 0.47
+    AREA_MISSING_RATE = 0.34
+    SUBURB_MISSING_RATE = 0.26
+
+    # Typical word counts for the abstract and cleaned content
+    ABSTRACT_WORDS = 20
+    CONTENT_WORDS = 300
+
+    TITLES = [
+        'Recruitment Consultant', 'Senior Developer', 'Data Scientist', 'Receptionist',
+        'Heavy Vehicle Mechanic', 'Registered Nurse', 'Project Engineer', 'Barista',
+        'Account Manager', 'Contracts Administrator', 'Warehouse Storeperson', 'Chef',
+        'Business Analyst', 'Payroll Officer', 'Property Manager', 'Electrician'
+    ]
+    SENIORITY = ['', 'Junior ', 'Senior ', 'Lead ', 'Graduate ', 'Experienced ']
+    SALARY_TEXTS = [
+        '$80k - $95k + Super', '$140k + Car Park', 'Attractive Commission Structure',
+        '$35 - $42 per hour', 'Competitive salary package', '$110,000 - $130,000 p.a.'
+    ]
+    SUBCLASSIFICATIONS = ['Other', 'Management', 'Administration', 'Developers/Programmers', 'Sales']
+    AREAS = ['CBD & Inner Suburbs', 'Northern Suburbs', 'Southern Suburbs', 'Eastern Suburbs', 'Western Suburbs']
+    SUBURBS = ['Coburg', 'Narellan', 'Ashwood', 'Dandenong', 'Parramatta', 'Fortitude Valley', 'Subiaco']
+    VOCABULARY = (
+        'team customer service experience skills role business opportunity support manage develop '
+        'communication stakeholder client working environment company growth leading position apply '
+        'culture excellent strong ability knowledge delivery detail project systems process quality '
+        'training career flexible hours salary benefits passionate motivated responsible requirements '
+        'python sql excel reporting analysis safety compliance licence qualification degree years'
+    ).split()
+
+    def __init__(self, seed: int = 42):
+        """Initialise with a seed so that corpora are reproducible across runs."""
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    def _sentence(self, n_words: int) -> str:
+        """Build a pseudo-sentence from the vocabulary."""
+        words = self._random.choices(self.VOCABULARY, k=n_words)
+        return ' '.join(words).capitalize() + '.'
+
+    def _html_content(self) -> str:
+        """Build HTML job content resembling SEEK ads (paragraphs, bold headings, bullets and entities)."""
+        n_paragraphs = self._random.randint(3, 6)
+        words_per_paragraph = self.CONTENT_WORDS // (n_paragraphs + 1)
+        parts = ['<HTML>']
+
+        for _ in range(n_paragraphs):
+            parts.append(f'<p>{self._sentence(words_per_paragraph // 2)}&nbsp; {self._sentence(words_per_paragraph // 2)}</p>')
+
+        parts.append('<p><strong>About you&nbsp;</strong></p><ul>')
+        for _ in range(self._random.randint(3, 6)):
+            parts.append(f'<li>&middot;&nbsp;{self._sentence(8)}</li>')
+        parts.append('</ul></HTML>')
+
+        return ''.join(parts)
+
+    def _metadata(self) -> dict:
+        """Build nested metadata with the same optional keys as the real corpus."""
+        metadata = {}
+
+        if self._random.random() >= self.STANDOUT_MISSING_RATE:
+            metadata['standout'] = {f'bullet{i}': self._sentence(5) for i in range(1, 4)}
+
+        if self._random.random() >= self.SALARY_MISSING_RATE:
+            metadata['additionalSalaryText'] = self._random.choice(self.SALARY_TEXTS)
+
+        metadata['classification'] = {'name': self._random.choice(FEATURE_OPTIONS['classification'])}
+        metadata['subClassification'] = {'name': self._random.choice(self.SUBCLASSIFICATIONS)}
+        metadata['location'] = {'name': self._random.choice(FEATURE_OPTIONS['Location'])}
+        metadata['workType'] = {'name': self._random.choice(FEATURE_OPTIONS['work_type'])}
+
+        if self._random.random() >= self.AREA_MISSING_RATE:
+            metadata['area'] = {'name': self._random.choice(self.AREAS)}
+
+        if self._random.random() >= self.SUBURB_MISSING_RATE:
+            metadata['suburb'] = {'name': self._random.choice(self.SUBURBS)}
+
+        return metadata
+
+    def generate_ad(self, ad_id: int) -> dict:
+        """Generate a single job ad record."""
+        title = f"{self._random.choice(self.SENIORITY)}{self._random.choice(self.TITLES)}"
+        return {
+            'id': str(ad_id),
+            'title': title,
+            'abstract': self._sentence(self.ABSTRACT_WORDS),
+            'content': self._html_content(),
+            'metadata': self._metadata()
+        }
+
+    @staticmethod
+    def fingerprint() -> str:
+        """Short hash of the generator and feature options, so corpora and results from different generators differ."""
+        digest = hashlib.sha1()
+        for module_path in (__file__, helpers.constant.__file__):
+            digest.update(Path(module_path).read_bytes())
+        return digest.hexdigest()[:8]
+
+    def write_corpus(self, file_path: str, n_ads: int) -> Path:
+        """Write n_ads line-delimited JSON records, reusing an existing file at the same path.
+
+        Callers should include fingerprint() in the file name so a changed generator does not reuse stale corpora.
+        """
+        file_path = Path(file_path)
+        if file_path.exists():
+            return file_path
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = file_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            for i in range(n_ads):
+                f.write(json.dumps(self.generate_ad(38800000 + i)) + '\n')
+        tmp_path.rename(file_path)
+
+        return file_path
+
+    @staticmethod
+    def to_index_record(ad: dict) -> dict:
+        """Flatten an ad into the record shape stored in the Pinecone index by get_data_for_insertion."""
+        record = {'_id': ad['id'], 'title': ad['title'], 'abstract': ad['abstract'], 'content': ad['content']}
+
+        def flatten(prefix: str, value):
+            if isinstance(value, dict):
+                for key, nested_value in value.items():
+                    flatten(f'{prefix}.{key}', nested_value)
+            else:
+                record[prefix] = value
+
+        flatten('metadata', ad['metadata'])
+        return record
+
+    @staticmethod
+    def to_search_results(records: list[dict], top_k: int = 20) -> list:
+        """Wrap flattened records in objects shaped like Pinecone search responses, top_k hits per page."""
+        pages = []
+
+        for i in range(0, len(records), top_k):
+            hits = []
+            for rank, record in enumerate(records[i:i + top_k]):
+                fields = {key: value for key, value in record.items() if key != '_id'}
+                hits.append({'_id': record['_id'], '_score': 1.0 - rank / top_k, 'fields': fields})
+            pages.append(SearchResponse(hits))
+
+        return pages
+
+    def resume_text(self, n_paragraphs: int = 40) -> list[str]:
+        """Generate resume paragraphs."""
+        return [self._sentence(25) for _ in range(n_paragraphs)]
+
+    def resume_docx(self, n_paragraphs: int = 40) -> bytes:
+        """Generate a DOCX resume."""
+        document = docx.Document()
+        for paragraph in self.resume_text(n_paragraphs):
+            document.add_paragraph(paragraph)
+
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return buffer.getvalue()
+
+    def resume_pdf(self, n_paragraphs: int = 40, lines_per_page: int = 45) -> bytes:
+        """Generate a minimal text-only PDF resume without extra dependencies."""
+        lines = []
+        for paragraph in self.resume_text(n_paragraphs):
+            words = paragraph.split()
+            lines.extend(' '.join(words[i:i + 12]) for i in range(0, len(words), 12))
+        pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+        # Objects 1-3 are the catalog, page tree and font; each page adds a page and a content stream
+        page_ids = [4 + 2 * i for i in range(len(pages))]
+        objects = [
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>".encode(),
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+        ]
+        for page_id, page_lines in zip(page_ids, pages):
+            stream = 'BT /F1 10 Tf 14 TL 50 800 Td ' + ' '.join(f'({line}) Tj T*' for line in page_lines) + ' ET'
+            objects.append(
+                f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                f'/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>'.encode()
+            )
+            objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream'.encode())
+
+        pdf = bytearray(b'%PDF-1.4\n')
+        offsets = []
+        for obj_id, body in enumerate(objects, start=1):
+            offsets.append(len(pdf))
+            pdf += f'{obj_id} 0 obj\n'.encode() + body + b'\nendobj\n'
+
+        xref_offset = len(pdf)
+        pdf += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+        for offset in offsets:
+            pdf += f'{offset:010d} 00000 n \n'.encode()
+        pdf += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n'.encode()
+
+        return bytes(pdf)
+
+
+class _SearchResult:
+    def __init__(self, hits: list[dict]):
+        self.hits = hits
+
+
+class SearchResponse:
+    """Stand-in for the Pinecone search response, exposing `.result.hits`."""
+
+    def __init__(self, hits: list[dict]):
+        self.result = _SearchResult(hits)
@@ -1,5 +1,6 @@
 from strands import Agent
 from strands.models.openai import OpenAIModel
+from helpers.tracing import tracer
 import os
 
 class JobAnalyser:
@@ -23,7 +24,8 @@ class JobAnalyser:
                  job_description: str,
                  system_prompt_path: str = "prompts/job_analyser_system_prompt.txt",
                  user_prompt_path: str = "prompts/job_analyser_user_prompt.txt",
-                 tools: list = None):
+                 tools: list = None,
+                 callback_handler=None):
 
         self._tools = tools
         self._user_resume = user_resume
@@ -35,7 +37,7 @@ class JobAnalyser:
         self._agent = Agent(
             model=self.MODEL,
             system_prompt=self._system_prompt,
-            callback_handler=None,
+            callback_handler=callback_handler,
             tools=self._tools
         )
 
@@ -59,12 +61,19 @@ class JobAnalyser:
 
     def generate_analysis(self) -> str:
         """Generate job analysis using the LLM"""
-        try:
-            llm_response = self._agent(self._user_prompt)
+        with tracer.span("llm.generate_analysis", model=self.MODEL_ID, prompt_chars=len(self._user_prompt)) as span:
+            try:
+                llm_response = self._agent(self._user_prompt)
 
-            return llm_response.message.get('content')[0].get('text')
-        except Exception as e:
-            print(f"Failed to generate generated_sections: {e}")
+                # Record token usage reported by the agent
+                usage = llm_response.metrics.accumulated_usage
+                span.set_attribute("input_tokens", usage.get('inputTokens'))
+                span.set_attribute("output_tokens", usage.get('outputTokens'))
+
+                return llm_response.message.get('content')[0].get('text')
+            except Exception as e:
+                span.set_attribute("error", type(e).__name__)
+                print(f"Failed to generate generated_sections: {e}")
 
 
 if __name__ == '__main__':
@@ -2,6 +2,7 @@ from pinecone import Pinecone
 
 import pandas as pd
 from helpers.data_loader import DataLoader
+from helpers.tracing import tracer
 import os
 import time
 
@@ -56,44 +57,50 @@ class PineconeHandler:
         total_batches = (total_records - 1) // batch_size + 1
         print(f"Upserting {total_records} records in {total_batches} batches")
 
-        # Upsert in batches to avoid rate limiting
-        for i in range(0, total_records, batch_size):
-            batch = self.records[i:i + batch_size]
-            batch_num = i // batch_size + 1
-            print(f"Processing batch {batch_num}/{total_batches} with {len(batch)} records")
-            time.sleep(1)  # To avoid rate limiting
-
-            try:
-                self.index.upsert_records(namespace, batch)
-                print(f"Successfully upserted batch {batch_num}")
-            except Exception as e:
-                print(f"Error upserting batch {batch_num}: {str(e)}")
-                raise
+        with tracer.span("pinecone.upsert_records", records=total_records, batch_size=batch_size,
+                         batches=total_batches):
+            # Upsert in batches to avoid rate limiting
+            for i in range(0, total_records, batch_size):
+                batch = self.records[i:i + batch_size]
+                batch_num = i // batch_size + 1
+                print(f"Processing batch {batch_num}/{total_batches} with {len(batch)} records")
+                time.sleep(1)  # To avoid rate limiting
+
+                try:
+                    with tracer.span("pinecone.upsert_batch", records=len(batch)):
+                        self.index.upsert_records(namespace, batch)
+                    print(f"Successfully upserted batch {batch_num}")
+                except Exception as e:
+                    print(f"Error upserting batch {batch_num}: {str(e)}")
+                    raise
 
     @staticmethod
     def convert_search_results_to_dataframe(search_results) -> pd.DataFrame:
         """Convert Pinecone search results to a pandas DataFrame."""
-        # Extract all records
-        records = []
+        with tracer.span("pinecone.convert_results") as span:
+            # Extract all records
+            records = []
+
+            # Iterate through search result
+            for item in search_results.result.hits:
 
-        # Iterate through search result
-        for item in search_results.result.hits:
+                # Start with the _id and _score
+                record = {
+                    'id': item['_id'],
+                    '_score': item['_score']
+                }
 
-            # Start with the _id and _score
-            record = {
-                'id': item['_id'],
-                '_score': item['_score']
-            }
+                # Add all fields from the nested fields dictionary
+                if 'fields' in item:
+                    for key, value in item['fields'].items():
+                        record[key] = value
 
-            # Add all fields from the nested fields dictionary
-            if 'fields' in item:
-                for key, value in item['fields'].items():
-                    record[key] = value
+                records.append(record)
 
-            records.append(record)
+            span.set_attribute("hits", len(records))
 
-        # Create DataFrame
-        return pd.DataFrame(records)
+            # Create DataFrame
+            return pd.DataFrame(records)
 
     def search(self,
                namespace: str,
@@ -103,16 +110,20 @@ class PineconeHandler:
         """Search the Pinecone index with the given query and return results as a DataFrame."""
         if self.index is None:
             self.index = self.pc.Index(self.index_name)
-        search_results = self.index.search(
-            namespace=namespace,
-            query={
-                "top_k": top_k,
-                "inputs": {
-                    'text': query
-                },
-                "filter": filter_dict
-            }
-        )
+
+        with tracer.span("pinecone.search", top_k=top_k, filter_count=len(filter_dict or {}),
+                         query_chars=len(query)) as span:
+            search_results = self.index.search(
+                namespace=namespace,
+                query={
+                    "top_k": top_k,
+                    "inputs": {
+                        'text': query
+                    },
+                    "filter": filter_dict
+                }
+            )
+            span.set_attribute("hits", len(search_results.result.hits))
 
         search_df = self.convert_search_results_to_dataframe(search_results)
         return search_df
@@ -0,0 +1,161 @@
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class Span:
+    """A single timed operation with attributes such as top_k, bytes or token counts."""
+    __slots__ = ('name', 'attributes', 'start_time', 'duration')
+
+    def __init__(self, name: str, attributes: dict):
+        self.name = name
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.duration = None
+
+    def set_attribute(self, key: str, value):
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        """Return the span as a JSON-compatible dictionary."""
+        return {
+            'name': self.name,
+            'start_time': self.start_time,
+            'duration_ms': round(self.duration * 1000, 3) if self.duration is not None else None,
+            'attributes': self.attributes
+        }
+
+
+class _NoopSpan:
+    """Span returned when tracing is disabled, so that call sites need no checks."""
+
+    def set_attribute(self, key: str, value):
+        pass
+
+
+class Tracer:
+    """Record span durations in rolling windows and export p50/p95/p99 summaries.
+
+    Recording a span costs two perf_counter calls and a locked deque append; percentiles
+    are only computed on export, so the tracer is cheap enough to leave on in production.
+    """
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, enabled: bool = True, window_size: int = 1000, recent_size: int = 50):
+        """Initialise with the number of durations kept per span name and recent spans kept overall."""
+        self.enabled = enabled
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._counts = {}
+        self._sums = {}
+        self._recent = deque(maxlen=recent_size)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time the enclosed block as a span, recording an error attribute if it raises."""
+        if not self.enabled:
+            yield _NoopSpan()
+            return
+
+        span = Span(name, attributes)
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.set_attribute('error', type(e).__name__)
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            self._record(span)
+
+    def _record(self, span: Span):
+        """Add a finished span to its rolling window."""
+        with self._lock:
+            if span.name not in self._durations:
+                self._durations[span.name] = deque(maxlen=self.window_size)
+                self._counts[span.name] = 0
+                self._sums[span.name] = 0.0
+            self._durations[span.name].append(span.duration)
+            self._counts[span.name] += 1
+            self._sums[span.name] += span.duration
+            self._recent.append(span)
+
+    @staticmethod
+    def _quantile(sorted_values: list[float], q: float) -> float:
+        """Nearest-rank quantile of pre-sorted values."""
+        return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+    def summary(self) -> list[dict]:
+        """Return count, total and rolling-window quantiles (in seconds) for each span name."""
+        with self._lock:
+            snapshot = {name: sorted(durations) for name, durations in self._durations.items()}
+            counts = dict(self._counts)
+            sums = dict(self._sums)
+
+        summaries = []
+        for name, durations in sorted(snapshot.items()):
+            summary = {'name': name, 'count': counts[name], 'sum': sums[name]}
+            for q in self.QUANTILES:
+                summary[f'p{round(q * 100)}'] = self._quantile(durations, q)
+            summaries.append(summary)
+
+        return summaries
+
+    def recent_spans(self) -> list[dict]:
+        """Return the most recently finished spans, newest first."""
+        with self._lock:
+            spans = list(self._recent)
+        return [span.to_dict() for span in reversed(spans)]
+
+    def to_prometheus(self, metric_name: str = 'seek_span_duration_seconds') -> str:
+        """Export the summaries in Prometheus text exposition format."""
+        lines = [
+            f'# HELP {metric_name} Span durations with quantiles over a rolling window.',
+            f'# TYPE {metric_name} summary'
+        ]
+        for summary in self.summary():
+            for q in self.QUANTILES:
+                value = summary[f'p{round(q * 100)}']
+                lines.append(f'{metric_name}{{span="{summary["name"]}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{metric_name}_sum{{span="{summary["name"]}"}} {summary["sum"]:.6f}')
+            lines.append(f'{metric_name}_count{{span="{summary["name"]}"}} {summary["count"]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def to_json_lines(self) -> str:
+        """Export the summaries as JSON lines, one per span name, stamped with the export time."""
+        timestamp = time.time()
+        return ''.join(json.dumps({'timestamp': timestamp, **summary}) + '\n' for summary in self.summary())
+
+    def write_prometheus(self, path: str):
+        """Atomically write the Prometheus export to a file, e.g. for the node exporter textfile collector."""
+        # A unique temp file in the target directory, so concurrent writers never share or steal it
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(os.path.abspath(path)),
+                                         prefix='.prometheus-', suffix='.tmp', delete=False) as f:
+            f.write(self.to_prometheus())
+        os.replace(f.name, path)
+
+    def start_prometheus_exporter(self, path: str, interval: float = 15.0) -> threading.Thread:
+        """Start a daemon thread that rewrites the Prometheus export every interval seconds."""
+        def export():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write_prometheus(path)
+                except Exception as e:
+                    print(f"Failed to write Prometheus export: {e}")
+
+        thread = threading.Thread(target=export, name="prometheus-exporter", daemon=True)
+        thread.start()
+        return thread
+
+
+# Shared tracer, disabled with TRACING_ENABLED=false
+tracer = Tracer(enabled=os.environ.get('TRACING_ENABLED', 'true').lower() != 'false')